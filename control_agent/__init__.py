@@ -1,3 +1,12 @@
-from .agent import root_agent
+# root_agent (and the agent module, which ADK's loader also looks up) are imported on first
+# access, so importing the package doesn't pull in google.adk (PEP 562).
+import importlib
 
 __all__ = ["root_agent"]
+
+
+def __getattr__(name):
+    if name in ("agent", "root_agent"):
+        agent = importlib.import_module(".agent", __name__)
+        return agent if name == "agent" else agent.root_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
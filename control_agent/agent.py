@@ -1,10 +1,154 @@
 # create a control agent that will call either search agent or multi tool agent
 
+import asyncio
 from google.adk.agents import Agent
 from google.adk.tools import agent_tool
+from google.adk.tools.tool_context import ToolContext
+from google.genai import types
+from google.adk.agents.callback_context import CallbackContext
+from typing import Any, Dict, List, Optional
+from google.adk.models import LlmRequest, LlmResponse
 from search_agent import root_agent as search_agent
 from multi_tool_agent import root_agent as multi_tool_agent
 from inventory_agent import root_agent as inventory_agent
+from control_agent import embedding
+from control_agent import prerouter
+from control_agent import routing_cache
+
+_ROUTING_QUERY_KEY = "temp:routing_query"
+_AGENT_TOOLS = {
+    tool.name: tool
+    for tool in (
+        agent_tool.AgentTool(agent=search_agent),
+        agent_tool.AgentTool(agent=multi_tool_agent),
+        agent_tool.AgentTool(agent=inventory_agent),
+    )
+}
+_AGENT_TOOL_NAMES = set(_AGENT_TOOLS)
+routing_cache.set_tools(_AGENT_TOOL_NAMES)
+_PREROUTER_TOOL_NAMES = {
+    prerouter.WEATHER_TIME: multi_tool_agent.name,
+    prerouter.SEARCH: search_agent.name,
+    prerouter.INVENTORY: inventory_agent.name,
+}
+# Tool declarations sent to the routing LLM are pruned to the agent tools most similar to
+# the query; search (the general fallback) and batch_call are always offered. Queries only
+# get here when the pre-router found them ambiguous, so the top two agents are kept.
+_TOOL_DESCRIPTIONS = {name: tool.description for name, tool in _AGENT_TOOLS.items()}
+_TOOL_SELECTION_K = 2
+_ALWAYS_DECLARED = {search_agent.name, "batch_call"}
+# Upper bound on sub-agents running at once for a single batch_call.
+_BATCH_CONCURRENCY = 3
+
+
+def _last_user_text(llm_request: LlmRequest) -> Optional[str]:
+    """Returns the text of the last user turn, or None if the turn is not plain user text (e.g. a tool response)."""
+    if llm_request.contents and llm_request.contents[-1].role == 'user':
+        parts = llm_request.contents[-1].parts
+        if parts and parts[0].text:
+            return parts[0].text
+    return None
+
+
+def _route_to(tool_name: str, user_text: str) -> LlmResponse:
+    """Builds an LlmResponse that calls the given agent tool directly, skipping the model."""
+    return LlmResponse(
+        content=types.Content(
+            role="model",
+            parts=[types.Part(function_call=types.FunctionCall(name=tool_name, args={"request": user_text}))],
+        )
+    )
+
+
+async def batch_call(invocations: List[Dict[str, Any]], tool_context: ToolContext) -> List[Dict[str, Any]]:
+    """Calls several agents concurrently for independent parts of the user's question.
+
+    Args:
+        invocations (List[Dict[str, Any]]): One entry per independent task, each of the form
+                                           {"agent": <agent name>, "request": <request for that agent>}.
+                                           "agent" must be one of "search_agent", "weather_time_agent"
+                                           or "sqlite_inventory_manager_agent".
+                                           Example: [{"agent": "weather_time_agent", "request": "weather in New York"},
+                                                     {"agent": "sqlite_inventory_manager_agent", "request": "list all items"}]
+
+    Returns:
+        List[Dict[str, Any]]: One result per invocation, in the same order, with the agent name and its response or an error message.
+    """
+    print(f"--- Tool: batch_call called with {len(invocations)} invocations ---")
+    semaphore = asyncio.Semaphore(_BATCH_CONCURRENCY)
+
+    async def _run(invocation: Dict[str, Any]) -> Dict[str, Any]:
+        agent_name = invocation.get("agent")
+        tool = _AGENT_TOOLS.get(agent_name)
+        if tool is None:
+            return {"agent": agent_name, "status": "error", "message": f"Unknown agent '{agent_name}'. Valid agents: {', '.join(_AGENT_TOOLS)}."}
+        async with semaphore:
+            try:
+                response = await tool.run_async(args={"request": invocation.get("request", "")}, tool_context=tool_context)
+            except Exception as e:
+                return {"agent": agent_name, "status": "error", "message": f"Agent call failed: {str(e)}"}
+        return {"agent": agent_name, "status": "success", "response": response}
+
+    return list(await asyncio.gather(*(_run(invocation) for invocation in invocations)))
+
+
+def _prune_tool_declarations(llm_request: LlmRequest, normalized_query: str, query_vector):
+    """Drops function declarations of agent tools unrelated to the query from the LLM request.
+    Only the declarations sent to the model change; every tool can still be executed."""
+    selected = prerouter.select_tools(normalized_query, query_vector, _TOOL_DESCRIPTIONS, _TOOL_SELECTION_K)
+    if selected is None or llm_request.config is None or not llm_request.config.tools:
+        return
+    keep = set(selected) | _ALWAYS_DECLARED
+    for tool in llm_request.config.tools:
+        if tool.function_declarations:
+            tool.function_declarations = [d for d in tool.function_declarations if d.name in keep]
+    print(f"[Callback] Offering tools: {sorted(keep)}")
+
+
+def route_without_llm(callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+    """Skips the routing LLM call when the query (or a near-identical one) was routed before,
+    or when the pre-router is confident about the target agent."""
+    user_text = _last_user_text(llm_request)
+    # Only the opening message of a conversation is routed by its text alone. Follow-ups
+    # ("delete it", "and in london?") depend on earlier turns, which neither the cache key nor
+    # the sub-agent (called with just this text, without the session history) can see.
+    if user_text is None or len(llm_request.contents) > 1:
+        return None
+    normalized_query = routing_cache.normalize(user_text)
+    tool_name = routing_cache.lookup(normalized_query)
+    query_vector = None
+    if tool_name is None:
+        # Embedded once and shared by the semantic cache, the pre-router and tool pruning.
+        vectors = embedding.embed([normalized_query])
+        query_vector = None if vectors is None else vectors[0]
+        tool_name = routing_cache.lookup_similar(normalized_query, query_vector)
+    if tool_name is not None:
+        print(f"[Callback] Routing cache hit. Calling {tool_name} directly.")
+        return _route_to(tool_name, user_text)
+    intent = prerouter.route(user_text, query_vector)
+    if intent is not None:
+        tool_name = _PREROUTER_TOOL_NAMES[intent]
+        print(f"[Callback] Pre-routed to {tool_name}. Skipping LLM call.")
+        return _route_to(tool_name, user_text)
+    print("[Callback] No cached or pre-routed decision. Proceeding with LLM call.")
+    # Set only on this path: ADK doesn't run the after_model_callback for a response returned
+    # above, so a key left behind there would be recorded against the next LLM call's choice.
+    callback_context.state[_ROUTING_QUERY_KEY] = normalized_query
+    _prune_tool_declarations(llm_request, normalized_query, query_vector)
+    return None
+
+
+def record_routing_decision(callback_context: CallbackContext, llm_response: LlmResponse) -> Optional[LlmResponse]:
+    """Stores the agent tool the LLM picked for the pending user query."""
+    normalized_query = callback_context.state.get(_ROUTING_QUERY_KEY)
+    if not normalized_query or not llm_response.content or not llm_response.content.parts:
+        return None
+    calls = [part.function_call for part in llm_response.content.parts if part.function_call]
+    if len(calls) == 1 and calls[0].name in _AGENT_TOOL_NAMES:
+        routing_cache.store(normalized_query, calls[0].name)
+    callback_context.state[_ROUTING_QUERY_KEY] = None
+    return None
+
 
 root_agent = Agent(
     name="control_agent",
@@ -16,9 +160,13 @@ root_agent = Agent(
         "You will decide which agent to call based on the user's question."
         "If the question is about the time or weather in a city, call the multi tool agent. "
         "If the question is about a general search, call the search agent. "
-        "If the question is about an inventory item, call the inventory agent."
+        "If the question is about an inventory item, call the inventory agent. "
+        "If the question contains several independent tasks for different agents (e.g. the weather in a city "
+        "and listing the inventory), call batch_call once with one invocation per task instead of calling "
+        "the agents one after another. "
+        f"The valid agent names for batch_call are: {', '.join(_AGENT_TOOLS)}."
     ),
-    tools=[agent_tool.AgentTool(agent=search_agent), 
-           agent_tool.AgentTool(agent=multi_tool_agent), 
-           agent_tool.AgentTool(agent=inventory_agent)],
+    tools=[*_AGENT_TOOLS.values(), batch_call],
+    before_model_callback=route_without_llm,
+    after_model_callback=record_routing_decision,
 )
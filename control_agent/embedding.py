@@ -0,0 +1,60 @@
+# Lazily loaded MiniLM sentence embeddings shared by the control agent's routing helpers.
+# sentence-transformers and numpy are optional: without them embed() returns None and
+# callers fall back to their exact-match / keyword paths. The model (which may first have
+# to be downloaded from the Hugging Face hub) is loaded in a background thread, started by
+# warm_up() at server start-up or by the first embed() call; until it is ready embed()
+# returns None instead of blocking the event loop. sentence-transformers (and torch) are
+# imported by that thread too, so importing this module stays cheap.
+
+import importlib.util
+import threading
+from typing import List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency
+    np = None
+
+AVAILABLE = np is not None and importlib.util.find_spec("sentence_transformers") is not None
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+_model = None
+_loader: Optional[threading.Thread] = None
+_loader_lock = threading.Lock()
+
+
+def _load_model():
+    global _model
+    from sentence_transformers import SentenceTransformer
+
+    print(f"[Embedding] Loading sentence-transformers model '{MODEL_NAME}'")
+    _model = SentenceTransformer(MODEL_NAME, device="cpu")
+    print(f"[Embedding] Model '{MODEL_NAME}' loaded")
+
+
+def warm_up() -> Optional[threading.Thread]:
+    """Starts loading the model in a background thread (once) and returns that thread,
+    or None if embeddings are unavailable."""
+    global _loader
+    if not AVAILABLE:
+        return None
+    with _loader_lock:
+        if _loader is None:
+            _loader = threading.Thread(target=_load_model, name="embedding-model-loader", daemon=True)
+            _loader.start()
+    return _loader
+
+
+def embed(texts: List[str], wait: bool = False) -> Optional["np.ndarray"]:
+    """Returns L2-normalized float32 embeddings for texts, or None if embeddings are unavailable
+    or the model is still loading. With wait=True, blocks until the model has loaded (only for
+    background threads)."""
+    if _model is None:
+        loader = warm_up()
+        if loader is None or not wait:
+            return None
+        loader.join()
+        if _model is None:  # Loading failed
+            return None
+    return _model.encode(texts, normalize_embeddings=True, convert_to_numpy=True).astype(np.float32)
@@ -0,0 +1,189 @@
+# CPU-only pre-router for the control agent: picks the target agent for obvious queries so
+# the routing LLM call can be skipped. With sentence-transformers and scikit-learn installed
+# it uses a logistic-regression head over MiniLM embeddings trained on the synthetic examples
+# below (trained in the background by warm_up()); otherwise, or until that is done, it falls
+# back to keyword rules for the clear-cut weather/time and inventory intents. Anything ambiguous is left to the LLM, and select_tools() ranks the
+# agent tools by description similarity so that call can be sent fewer tool schemas.
+
+import importlib.util
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from control_agent import embedding
+
+# scikit-learn is optional, and imported by the training thread so importing this module stays cheap.
+_HAS_SKLEARN = importlib.util.find_spec("sklearn") is not None
+
+CONFIDENCE_THRESHOLD = 0.85
+
+# Intents, mapped to agent tools by the control agent.
+WEATHER_TIME = "weather_time"
+SEARCH = "search"
+INVENTORY = "inventory"
+
+# Synthetic training examples per intent for the classifier.
+_EXAMPLES: Dict[str, List[str]] = {
+    WEATHER_TIME: [
+        "what is the weather in new york",
+        "how is the weather today in london",
+        "is it raining in paris right now",
+        "what's the temperature in tokyo",
+        "weather forecast for chicago",
+        "what time is it in new york",
+        "current time in sydney",
+        "tell me the local time in berlin",
+        "what's the time in los angeles",
+        "is it sunny in miami",
+    ],
+    SEARCH: [
+        "who won the world cup in 2018",
+        "what is the capital of australia",
+        "search for the latest news on electric cars",
+        "who wrote pride and prejudice",
+        "how tall is mount everest",
+        "find information about the python programming language",
+        "what are the health benefits of green tea",
+        "when was the eiffel tower built",
+        "explain how photosynthesis works",
+        "who is the ceo of google",
+    ],
+    INVENTORY: [
+        "add a laptop to the inventory for 1200 dollars",
+        "i bought a harry potter book for 20$ to my collection",
+        "list all items",
+        "show me the inventory",
+        "delete item 12",
+        "update the price of item 3 to 50",
+        "what items are in the electronics category",
+        "show items cheaper than 100 dollars",
+        "create a new item called desk lamp",
+        "how many chairs do we have in stock",
+    ],
+}
+
+# Only single-clause, single-intent queries are routed without the LLM, by either path.
+# Queries joined with "and"/"also"/"then", split by ";" or into several sentences, or with cue
+# words of more than one intent (e.g. "weather in paris" plus "add a laptop") may need several
+# agents, so they are left to the LLM, which can call them together with batch_call.
+_MULTI_CLAUSE_RE = re.compile(r"\b(?:and|also|then|plus)\b|;|[.?!]\s+\S", re.I)
+_INTENT_CUES: Dict[str, "re.Pattern[str]"] = {
+    WEATHER_TIME: re.compile(
+        r"\b(?:weather|temperature|forecast|rain\w*|snow\w*|sunny|cloudy|humidity|hot|cold|time)\b", re.I
+    ),
+    INVENTORY: re.compile(
+        r"\b(?:inventory|items?|add|added|create|delete|remove|update|list|buy|bought|price|dollars?|stock|collection)\b",
+        re.I,
+    ),
+    SEARCH: re.compile(
+        r"\b(?:search|find|look up|who|why|when|explain|news|flights?|convert|what happened|how (?:do|does|to|can))\b",
+        re.I,
+    ),
+}
+
+# Keyword rules for the fallback path, which routes without any confidence score, so each
+# rule needs an unambiguous anchor: "the/my/our inventory", or a weather/time phrase whose
+# query ends in "in <place>" (up to three words, optionally followed by "today"/"now" etc.),
+# which rules out e.g. "temperature in fahrenheit to celsius" or "this time in 1969".
+_PLACE = r"\bin (?!(?:the|a|an|my|your|our|this|that)\b)[a-z]+(?: [a-z]+){0,2}"
+_WHEN = r"(?: (?:today|tonight|tomorrow|now|right now))?"
+_KEYWORD_RULES: Dict[str, "re.Pattern[str]"] = {
+    WEATHER_TIME: re.compile(
+        r"\b(?:weather|raining|snowing|sunny|what time is it|current time|local time)\b.*" + _PLACE + _WHEN + r"\W*$",
+        re.I,
+    ),
+    INVENTORY: re.compile(r"\b(?:the|my|our) inventory\b", re.I),
+}
+
+_classifier = None
+_trainer: Optional[threading.Thread] = None
+_trainer_lock = threading.Lock()
+# Embeddings of tool descriptions, keyed by the (name, description) pairs they were computed for.
+_description_vectors: Dict[Tuple[Tuple[str, str], ...], object] = {}
+
+
+def _train_classifier():
+    """Trains the intent classifier on the synthetic examples, waiting for the embedding model."""
+    global _classifier
+    from sklearn.linear_model import LogisticRegression
+
+    texts = [text for examples in _EXAMPLES.values() for text in examples]
+    labels = [intent for intent, examples in _EXAMPLES.items() for _ in examples]
+    vectors = embedding.embed(texts, wait=True)
+    if vectors is None:
+        return
+    classifier = LogisticRegression(C=10.0, max_iter=1000)
+    classifier.fit(vectors, labels)
+    _classifier = classifier
+    print("[PreRouter] Intent classifier trained")
+
+
+def warm_up():
+    """Loads the embedding model and trains the intent classifier in background threads, so the
+    first requests don't pay for either on the event loop. Safe to call more than once."""
+    global _trainer
+    embedding.warm_up()
+    if not _HAS_SKLEARN or not embedding.AVAILABLE:
+        return
+    with _trainer_lock:
+        if _trainer is None:
+            _trainer = threading.Thread(target=_train_classifier, name="prerouter-trainer", daemon=True)
+            _trainer.start()
+
+
+def _get_classifier():
+    """Returns the intent classifier, or None while it is being trained or if its dependencies are missing."""
+    if _classifier is None:
+        warm_up()
+    return _classifier
+
+
+def _keyword_intents(query: str) -> List[str]:
+    """Returns the intents whose keyword rule matches the query."""
+    return [intent for intent, pattern in _KEYWORD_RULES.items() if pattern.search(query)]
+
+
+def _may_need_several_agents(query: str) -> bool:
+    """Returns True if the query has several clauses or cue words of more than one intent."""
+    if _MULTI_CLAUSE_RE.search(query):
+        return True
+    return sum(1 for pattern in _INTENT_CUES.values() if pattern.search(query)) > 1
+
+
+def route(query: str, query_vector) -> Optional[str]:
+    """Returns the intent for a query when it is confidently a single intent, else None.
+    query is the user's text (punctuation helps to spot several sentences); query_vector is
+    its embedding (see embedding.embed), or None if unavailable."""
+    if _may_need_several_agents(query):
+        return None
+    keyword_intents = _keyword_intents(query)
+
+    classifier = _get_classifier()
+    if classifier is not None and query_vector is not None:
+        probabilities = classifier.predict_proba(query_vector.reshape(1, -1))[0]
+        best = int(probabilities.argmax())
+        intent, confidence = classifier.classes_[best], float(probabilities[best])
+        print(f"[PreRouter] Classifier: {intent} ({confidence:.2f})")
+        return intent if confidence >= CONFIDENCE_THRESHOLD else None
+
+    if len(keyword_intents) == 1:
+        print(f"[PreRouter] Keyword rule: {keyword_intents[0]}")
+        return keyword_intents[0]
+    return None
+
+
+def select_tools(query: str, query_vector, descriptions: Dict[str, str], k: int) -> Optional[List[str]]:
+    """Returns the names of the k tools whose descriptions are most similar to the query,
+    or None if every tool should be offered (multi-intent query or no embeddings)."""
+    if query_vector is None or _may_need_several_agents(query):
+        return None
+    key = tuple(descriptions.items())
+    description_vectors = _description_vectors.get(key)
+    if description_vectors is None:
+        description_vectors = embedding.embed(list(descriptions.values()))
+        if description_vectors is None:
+            return None
+        _description_vectors[key] = description_vectors
+    scores = description_vectors @ query_vector
+    names = list(descriptions)
+    return [names[i] for i in scores.argsort()[::-1][:k]]
@@ -0,0 +1,224 @@
+# Two-tier cache of control agent routing decisions (normalized query -> agent tool name).
+# System 1 is an exact dict lookup on the normalized query; System 2 is a cosine-similarity
+# search over MiniLM embeddings of previously routed queries. Both tiers form one bounded
+# LRU store, persisted in bot_sessions.db next to the ADK sessions so it survives restarts.
+# The database is only opened on first use, and loading and every write (with the embedding
+# of the stored query) run on a background worker thread, off the event loop.
+
+import json
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+from control_agent.embedding import embed, np
+
+DB_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bot_sessions.db")
+SIMILARITY_THRESHOLD = 0.9
+# Upper bound on cached decisions, in memory and in the routing_cache table; the least
+# recently used ones are evicted first.
+MAX_ENTRIES = 2048
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_LOCK = threading.Lock()
+# Runs _load and then the _store calls in submission order; only this thread uses _conn.
+_WORKER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="routing-cache")
+_conn: Optional[sqlite3.Connection] = None
+_loading: Optional[Future] = None
+# Agent tools a decision may route to, set by the control agent. Decisions for any other tool
+# (e.g. an agent that has since been renamed) are dropped on load and on lookup.
+_tool_names: FrozenSet[str] = frozenset()
+
+# Exact tier in LRU order (oldest first). Only touched while holding _LOCK.
+_exact: "OrderedDict[str, str]" = OrderedDict()
+# Semantic tier: a fixed (MAX_ENTRIES, dim) float32 matrix of normalized embeddings,
+# allocated on first use. Each stored query owns one row, which is overwritten when the
+# query is re-routed and zeroed (so it can never match) when the query is evicted.
+_semantic_matrix = None
+_semantic_rows: Dict[str, int] = {}
+_semantic_tools: List[Optional[str]] = [None] * MAX_ENTRIES
+_semantic_queries: List[Optional[str]] = [None] * MAX_ENTRIES
+_free_rows: List[int] = list(range(MAX_ENTRIES - 1, -1, -1))
+
+
+def _discard(query: str):
+    """Removes an entry from both tiers. Called with _LOCK held."""
+    _exact.pop(query, None)
+    row = _semantic_rows.pop(query, None)
+    if row is not None:
+        _semantic_matrix[row] = 0.0
+        _semantic_tools[row] = None
+        _semantic_queries[row] = None
+        _free_rows.append(row)
+
+
+def _evict():
+    """Drops the least recently used entries beyond MAX_ENTRIES. Called with _LOCK held."""
+    while len(_exact) > MAX_ENTRIES:
+        _discard(next(iter(_exact)))
+
+
+def _put(query: str, tool: str, vector):
+    """Adds or replaces an entry in both tiers. Called with _LOCK held."""
+    global _semantic_matrix
+    _exact[query] = tool
+    _exact.move_to_end(query)
+    _evict()
+    if vector is None:
+        return
+    if _semantic_matrix is None:
+        _semantic_matrix = np.zeros((MAX_ENTRIES, vector.shape[-1]), dtype=np.float32)
+    row = _semantic_rows.get(query)
+    if row is None:
+        row = _semantic_rows[query] = _free_rows.pop()
+    _semantic_matrix[row] = vector
+    _semantic_tools[row] = tool
+    _semantic_queries[row] = query
+
+
+def _load():
+    """Opens the database and loads persisted routing decisions into the in-process lookup structures."""
+    global _conn
+    try:
+        _conn = sqlite3.connect(DB_FILE)
+        _conn.execute("""
+            CREATE TABLE IF NOT EXISTS routing_cache (
+                query TEXT PRIMARY KEY,
+                tool TEXT NOT NULL,
+                embedding BLOB -- float32 MiniLM embedding, NULL when embeddings are unavailable
+            )
+        """)
+        _conn.execute(
+            "DELETE FROM routing_cache WHERE tool NOT IN (SELECT value FROM json_each(?))",
+            (json.dumps(sorted(_tool_names)),),
+        )
+        _conn.commit()
+        # rowid order is store order (INSERT OR REPLACE assigns a new rowid), so the most
+        # recently stored decisions end up most recently used.
+        rows = _conn.execute(
+            "SELECT query, tool, embedding FROM routing_cache ORDER BY rowid DESC LIMIT ?", (MAX_ENTRIES,)
+        ).fetchall()
+    except sqlite3.Error as e:
+        print(f"[RoutingCache] Failed to load cached routing decisions: {e}")
+        return
+    with _LOCK:
+        for query, tool, blob in reversed(rows):
+            vector = np.frombuffer(blob, dtype=np.float32) if blob is not None and np is not None else None
+            _put(query, tool, vector)
+    print(f"[RoutingCache] Loaded {len(_exact)} cached routing decisions from '{DB_FILE}'.")
+
+
+def _loaded() -> bool:
+    """Starts loading the persisted decisions on first use; returns True once they are loaded."""
+    global _loading
+    if _loading is None:
+        with _LOCK:
+            if _loading is None:
+                _loading = _WORKER.submit(_load)
+    return _loading.done()
+
+
+def _delete(normalized_query: str):
+    """Deletes a persisted routing decision. Runs on the worker thread."""
+    if _conn is None:
+        return
+    try:
+        _conn.execute("DELETE FROM routing_cache WHERE query = ?", (normalized_query,))
+        _conn.commit()
+    except sqlite3.Error as e:
+        print(f"[RoutingCache] Failed to delete routing decision: {e}")
+
+
+def _drop_unknown_tool(normalized_query: str, tool: str):
+    """Discards a decision for a tool that no longer exists. Called with _LOCK held."""
+    print(f"[RoutingCache] Dropping '{normalized_query}' -> {tool}: not a current agent tool")
+    _discard(normalized_query)
+    _WORKER.submit(_delete, normalized_query)
+
+
+def _store(normalized_query: str, tool: str):
+    """Embeds and records a routing decision. Runs on the worker thread."""
+    if _exact.get(normalized_query) == tool:
+        return
+    vector = embed([normalized_query])
+    with _LOCK:
+        _put(normalized_query, tool, None if vector is None else vector[0])
+    if _conn is None:
+        return
+    try:
+        _conn.execute(
+            "INSERT OR REPLACE INTO routing_cache (query, tool, embedding) VALUES (?, ?, ?)",
+            (normalized_query, tool, None if vector is None else vector[0].tobytes()),
+        )
+        _conn.execute(
+            "DELETE FROM routing_cache WHERE rowid NOT IN (SELECT rowid FROM routing_cache ORDER BY rowid DESC LIMIT ?)",
+            (MAX_ENTRIES,),
+        )
+        _conn.commit()
+    except sqlite3.Error as e:
+        print(f"[RoutingCache] Failed to persist routing decision: {e}")
+        return
+    print(f"[RoutingCache] Stored: '{normalized_query}' -> {tool}")
+
+
+def set_tools(tool_names: Iterable[str]):
+    """Sets the agent tools routing decisions may name. Call before the first lookup."""
+    global _tool_names
+    _tool_names = frozenset(tool_names)
+
+
+def normalize(query: str) -> str:
+    """Lower-cases the query, strips punctuation and collapses whitespace."""
+    return _WHITESPACE_RE.sub(" ", _PUNCTUATION_RE.sub("", query.lower())).strip()
+
+
+def lookup(normalized_query: str) -> Optional[str]:
+    """Returns the cached tool name for a normalized query from the exact tier, or None on a miss
+    (always, until the persisted decisions have been loaded)."""
+    if not _loaded():
+        return None
+    with _LOCK:
+        tool = _exact.get(normalized_query)
+        if tool is not None and tool not in _tool_names:
+            _drop_unknown_tool(normalized_query, tool)
+            tool = None
+        if tool is not None:
+            _exact.move_to_end(normalized_query)
+    if tool is not None:
+        print(f"[RoutingCache] Exact hit: '{normalized_query}' -> {tool}")
+    return tool
+
+
+def lookup_similar(normalized_query: str, query_vector) -> Optional[str]:
+    """Returns the tool of the most similar previously routed query from the semantic tier, or
+    None on a miss. query_vector is the query's embedding (see embedding.embed), or None."""
+    if query_vector is None or not _loaded() or not _semantic_rows:
+        return None
+    with _LOCK:
+        scores = _semantic_matrix @ query_vector
+        best = int(scores.argmax())
+        if scores[best] < SIMILARITY_THRESHOLD:
+            return None
+        tool = _semantic_tools[best]
+        if tool not in _tool_names:
+            _drop_unknown_tool(_semantic_queries[best], tool)
+            return None
+        # Promote to the exact tier so the next identical query skips the embedding.
+        _exact[normalized_query] = tool
+        _evict()
+    print(f"[RoutingCache] Semantic hit ({scores[best]:.3f}): '{normalized_query}' -> {tool}")
+    return tool
+
+
+def store(normalized_query: str, tool: str):
+    """Records the tool the LLM routed a normalized query to, replacing any earlier decision.
+    Returns immediately; the decision is embedded and written on the worker thread."""
+    if not normalized_query:
+        return
+    _loaded()
+    _WORKER.submit(_store, normalized_query, tool)
@@ -1,29 +1,63 @@
 from inventory_agent.inventory import create_item
+from inventory_agent.inventory import create_items
 from inventory_agent.inventory import read_item
 from inventory_agent.inventory import read_all_items
+from inventory_agent.inventory import search_items
 from inventory_agent.inventory import update_item
 from inventory_agent.inventory import delete_item
 
+import asyncio
+import functools
+import re
 from google.adk.agents import Agent
 from google.genai import types 
 from google.adk.agents.callback_context import CallbackContext
 from typing import Optional
 from google.adk.models import LlmRequest, LlmResponse
 
+def _off_event_loop(func):
+    """Wraps a blocking SQLite tool as a coroutine tool that runs in a worker thread,
+    keeping the FastAPI event loop free while the query runs. functools.wraps keeps the
+    name, docstring and signature ADK uses to build the tool declaration."""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await asyncio.to_thread(func, *args, **kwargs)
+    return wrapper
+
+
+# Sensitive terms and create/add intent, each compiled into a single regex so the check is one
+# C-level pass over the message. Only the leading word boundary is anchored so plurals and
+# inflections ("weapons", "added") still match, as the old substring check did.
+# The message is ASCII-lower-cased once with bytes.translate and first pretested with plain
+# substring scans (much faster than the regex on long text); most messages contain none of
+# the terms, so the regexes only run on the rare hit.
+_ASCII_LOWER = bytes.maketrans(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", b"abcdefghijklmnopqrstuvwxyz")
+_SENSITIVE_TERMS = (b"weapon", b"drug", b"explosive", b"illegal", b"controlled substance")
+_SENSITIVE_RE = re.compile(rb"\b(?:" + b"|".join(map(re.escape, _SENSITIVE_TERMS)) + rb")")
+_INTENT_RE = re.compile(rb"\b(?:create|add)")
+
+
+def _is_sensitive_create(message: str) -> bool:
+    """Returns True if the message asks to create/add a sensitive item."""
+    text = message.encode().translate(_ASCII_LOWER)
+    if not any(term in text for term in _SENSITIVE_TERMS):
+        return False
+    return bool(_SENSITIVE_RE.search(text) and _INTENT_RE.search(text))
+
+
 # --- Define your callback function ---# Create callbacks instance
 def check_sesnitive_items(callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
     """Inspects/modifies the LLM request or skips the call."""
     agent_name = callback_context.agent_name
     print(f"[Callback] Before model call for agent: {agent_name}")
-    sensitive_items = ["weapon", "drug", "explosive", "illegal", "controlled substance"]
     # Inspect the last user message in the request contents
     last_user_message = ""
     if llm_request.contents and llm_request.contents[-1].role == 'user':
          if llm_request.contents[-1].parts:
             last_user_message = llm_request.contents[-1].parts[0].text
     print(f"[Callback] Inspecting last user message: '{last_user_message}'")
-    # last_user_message is not None and contains any of the sensitive items
-    if last_user_message is not None and any(word in last_user_message for word in sensitive_items) and ("create" in last_user_message or "add" in last_user_message):
+    # last_user_message mentions a sensitive item together with a create/add intent
+    if last_user_message and _is_sensitive_create(last_user_message):
         print("[Callback] Sensitive item detected. Skipping LLM call.")
         # Return an LlmResponse to skip the actual LLM call
         return LlmResponse(
@@ -47,18 +81,23 @@ root_agent = Agent(
         "You are an efficient inventory management assistant backed by a persistent SQLite database. "
         "You can create new items, read existing items by their ID, list all items (with optional filters for category, min_price, and max_price), "
         "update item details, and delete items from the inventory. "
+        "When creating several items at once, use the 'create_items' tool with all of them in a single call. "
         "When creating an item, ensure you have at least a 'name'. Ask for other details like 'price' and 'category' if not provided but useful. "
         "All data is persistent. Always confirm actions taken (creation, update, deletion) and provide clear feedback, including item IDs when relevant. "
         "If a user asks to 'get all items', 'list items', or 'show inventory', use the 'read_all_items' tool. "
+        "Only set 'include_extra' on 'read_all_items' when the user needs fields other than name, price and category. "
+        "If a user looks for items by keywords or name (e.g. 'find the harry potter book'), use the 'search_items' tool. "
         "Be precise with IDs for read, update, and delete operations. If an ID is not found, clearly state that."
         "When updating, only change the fields specified by the user."
     """,
     tools=[
-        create_item,
-        read_item,
-        read_all_items,
-        update_item,
-        delete_item
+        _off_event_loop(create_item),
+        _off_event_loop(create_items),
+        _off_event_loop(read_item),
+        _off_event_loop(read_all_items),
+        _off_event_loop(search_items),
+        _off_event_loop(update_item),
+        _off_event_loop(delete_item)
     ],
     before_model_callback=check_sesnitive_items,
 )
@@ -1,25 +1,271 @@
+import copy
+import functools
 import sqlite3
+from collections import OrderedDict
+import threading
 import uuid
 import json
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Final, Optional, List, Tuple, Union
+
+# orjson is much faster than the stdlib json module; fall back to json when it isn't installed.
+try:
+    import orjson
+
+    def _json_dumps(data: Any) -> str:
+        return orjson.dumps(data).decode()
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
 
 # --- SQLite Database Configuration ---
 DB_NAME = "inventory_sqlite.db"
 
+# A single shared connection (autocommit, WAL) is reused by every tool call instead of
+# reconnecting per call; _LOCK serializes access since tools may run on several threads.
+_CONN = sqlite3.connect(DB_NAME, check_same_thread=False, isolation_level=None, cached_statements=512)
+_CONN.execute("PRAGMA journal_mode=WAL")
+_CONN.execute("PRAGMA synchronous=NORMAL")
+_CONN.execute("PRAGMA temp_store=MEMORY")
+_CONN.execute("PRAGMA cache_size=-20000")
+_CONN.execute("PRAGMA foreign_keys=ON")
+_LOCK = threading.Lock()
+_LOCAL = threading.local()
+
+# --- SQL statements ---
+# Kept as constants so every call hands SQLite the identical string and hits the
+# connection's prepared statement cache instead of re-parsing and re-planning.
+# Items are addressed either by their integer id or by their uuid; statements that look up a
+# single item are kept in one variant per key column, see _item_key().
+_KEY_COLUMNS: Final = ("id", "uuid")
+
+# additional_data is stored in SQLite's binary JSONB format where the library supports it
+# (3.45+), else as minified JSON text. Reads always go through json(), so callers get text
+# either way. A database written with JSONB needs a 3.45+ library to be read back.
+_JSON_STORE: Final = "jsonb" if sqlite3.sqlite_version_info >= (3, 45, 0) else "json"
+
+# The hot columns live in items; additional_data lives in the items_extra side table (only
+# for items that have any) so listing items scans narrow rows. Selects always produce
+# (id, uuid, name, price, category, additional_data) rows for _dict_factory.
+_ITEM_COLUMNS: Final = "items.id, items.uuid, items.name, items.price, items.category"
+_JOIN_EXTRA: Final = "LEFT JOIN items_extra ON items_extra.id = items.id"
+
+def _per_key_column(sql: str) -> Dict[str, str]:
+    """Expands a statement containing {key} into one variant per key column."""
+    return {column: sql.replace("{key}", column) for column in _KEY_COLUMNS}
+
+_SQL_INSERT_ROW: Final = """
+    INSERT INTO items (uuid, name, price, category)
+    VALUES (?, ?, ?, ?)
+"""
+_SQL_INSERT: Final = _SQL_INSERT_ROW + "RETURNING id"
+_SQL_INSERT_EXTRA: Final = f"INSERT INTO items_extra (id, additional_data) VALUES (?, {_JSON_STORE}(?))"
+_SQL_INSERT_EXTRA_BY_UUID: Final = f"INSERT INTO items_extra (id, additional_data) SELECT id, {_JSON_STORE}(?) FROM items WHERE uuid = ?"
+# Maps a JSON array of UUIDs to their item IDs, in array order (used after bulk inserts).
+_SQL_SELECT_IDS_BY_UUID: Final = """
+    SELECT items.id FROM json_each(?) AS uuids
+    JOIN items ON items.uuid = uuids.value
+    ORDER BY uuids.key
+"""
+_SQL_SELECT_ONE: Final = _per_key_column(
+    f"SELECT {_ITEM_COLUMNS}, json(items_extra.additional_data) FROM items {_JOIN_EXTRA} WHERE items.{{key}} = ?"
+)
+_SQL_SELECT_ALL: Final = f"SELECT {_ITEM_COLUMNS}, NULL FROM items"
+_SQL_SELECT_ALL_WITH_EXTRA: Final = f"SELECT {_ITEM_COLUMNS}, json(items_extra.additional_data) FROM items {_JOIN_EXTRA}"
+_SQL_SELECT_EXTRA: Final = "SELECT json(additional_data) FROM items_extra WHERE id = ?"
+# RETURNING reports the value as bound, before the REAL column affinity is applied, so an
+# integer price is converted here to match what a later SELECT returns.
+_SQL_UPDATE_RETURNING: Final = "RETURNING id, uuid, name, CASE typeof(price) WHEN 'real' THEN price * 1.0 ELSE price END, category"
+_SQL_SELECT_ITEM_ROW: Final = _per_key_column("SELECT id, uuid, name, price, category FROM items WHERE {key} = ?")
+# Merges a JSON patch into an item's additional_data, creating the side row if needed.
+_SQL_PATCH_EXTRA: Final = f"""
+    INSERT INTO items_extra (id, additional_data) VALUES (?, {_JSON_STORE}_patch('{{}}', ?))
+    ON CONFLICT (id) DO UPDATE SET additional_data = {_JSON_STORE}_patch(additional_data, ?)
+    RETURNING json(additional_data)
+"""
+_SQL_SEARCH: Final = f"""
+    SELECT {_ITEM_COLUMNS}, NULL FROM items_fts
+    JOIN items ON items.id = items_fts.rowid
+    WHERE items_fts MATCH ?
+    ORDER BY items_fts.rank
+    LIMIT 50
+"""
+# items_extra rows are removed by ON DELETE CASCADE.
+_SQL_DELETE: Final = _per_key_column("DELETE FROM items WHERE {key} = ? RETURNING id, uuid, name")
+
+@functools.lru_cache(maxsize=16)
+def _build_read_all_sql(include_extra: bool, has_category: bool, has_min_price: bool, has_max_price: bool) -> str:
+    """Builds the read_all_items query once per combination of options."""
+    query = _SQL_SELECT_ALL_WITH_EXTRA if include_extra else _SQL_SELECT_ALL
+    conditions = []
+    if has_category:
+        conditions.append("category = ?")
+    if has_min_price:
+        conditions.append("price >= ?")
+    if has_max_price:
+        conditions.append("price <= ?")
+    if conditions:
+        return query + " WHERE " + " AND ".join(conditions)
+    return query
+
+@functools.lru_cache(maxsize=32)
+def _build_update_sql(key_column: str, columns: Tuple[str, ...]) -> str:
+    """Builds the update_item statement once per key column and set of updated columns. It
+    returns the (id, uuid, name, price, category) row; with no columns it only selects it."""
+    if not columns:
+        return _SQL_SELECT_ITEM_ROW[key_column]
+    assignments = ", ".join(f"{column} = ?" for column in columns)
+    return f"UPDATE items SET {assignments} WHERE {key_column} = ? {_SQL_UPDATE_RETURNING}"
+
+def _cursor(row_factory=None) -> sqlite3.Cursor:
+    """Returns this thread's reusable cursor on the shared connection. Call while holding _LOCK."""
+    cursor = getattr(_LOCAL, "cursor", None)
+    if cursor is None:
+        cursor = _LOCAL.cursor = _CONN.cursor()
+    cursor.row_factory = row_factory
+    return cursor
+
+# Bumped whenever init_db() has to migrate existing databases; stored in PRAGMA user_version.
+_SCHEMA_VERSION: Final = 5
+
+_SQL_CREATE_TABLES: Final = (
+    """
+    CREATE TABLE IF NOT EXISTS items (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, -- Compact rowid alias used for lookups and joins
+        uuid TEXT NOT NULL UNIQUE, -- Stable external identifier
+        name TEXT NOT NULL,
+        price REAL,
+        category TEXT COLLATE NOCASE -- Case-insensitive, so category filters can use the index
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS items_extra (
+        id INTEGER PRIMARY KEY REFERENCES items(id) ON DELETE CASCADE,
+        additional_data BLOB NOT NULL -- Other fields as a JSON object, see _JSON_STORE
+    )
+    """,
+)
+
+# Full-text index over item names, categories and additional_data values, keyed by item id
+# (the FTS rowid) and kept in sync by triggers on both tables.
+_EXTRA_VALUES: Final = "(SELECT group_concat(value, ' ') FROM json_each(new.additional_data))"
+_SQL_CREATE_SEARCH_INDEX: Final = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(name, category, extras)",
+    """
+    CREATE TRIGGER IF NOT EXISTS items_fts_insert AFTER INSERT ON items BEGIN
+        INSERT INTO items_fts (rowid, name, category) VALUES (new.id, new.name, new.category);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_fts_update AFTER UPDATE OF name, category ON items BEGIN
+        UPDATE items_fts SET name = new.name, category = new.category WHERE rowid = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_fts_delete AFTER DELETE ON items BEGIN
+        DELETE FROM items_fts WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS items_extra_fts_insert AFTER INSERT ON items_extra BEGIN
+        UPDATE items_fts SET extras = {_EXTRA_VALUES} WHERE rowid = new.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS items_extra_fts_update AFTER UPDATE OF additional_data ON items_extra BEGIN
+        UPDATE items_fts SET extras = {_EXTRA_VALUES} WHERE rowid = new.id;
+    END
+    """,
+)
+# Repopulates the full-text index from scratch (after schema upgrades).
+_SQL_REBUILD_SEARCH_INDEX: Final = (
+    "DELETE FROM items_fts",
+    f"""
+    INSERT INTO items_fts (rowid, name, category, extras)
+    SELECT items.id, items.name, items.category,
+           (SELECT group_concat(value, ' ') FROM json_each(items_extra.additional_data))
+    FROM items {_JOIN_EXTRA}
+    """,
+)
+
+# Copies rows from an older items table (renamed to items_old) into the current schema.
+_NON_EMPTY_ADDITIONAL_DATA: Final = "items_old.additional_data IS NOT NULL AND json(items_old.additional_data) <> '{}'"
+_SQL_MIGRATE_ITEMS: Final = {
+    # Version 0: UUID text primary key; the old IDs become the uuid column.
+    0: (
+        """
+        INSERT INTO items (uuid, name, price, category)
+        SELECT id, name, price, category FROM items_old
+        """,
+        f"""
+        INSERT INTO items_extra (id, additional_data)
+        SELECT items.id, {_JSON_STORE}(items_old.additional_data) FROM items_old
+        JOIN items ON items.uuid = items_old.id
+        WHERE {_NON_EMPTY_ADDITIONAL_DATA}
+        """,
+    ),
+    # Version 1: integer IDs, case-sensitive category column.
+    # Version 2: additional_data stored as JSON text.
+    # Version 3: additional_data stored in the items table.
+    **dict.fromkeys((1, 2, 3), (
+        """
+        INSERT INTO items (id, uuid, name, price, category)
+        SELECT id, uuid, name, price, category FROM items_old
+        """,
+        f"""
+        INSERT INTO items_extra (id, additional_data)
+        SELECT id, {_JSON_STORE}(additional_data) FROM items_old
+        WHERE {_NON_EMPTY_ADDITIONAL_DATA}
+        """,
+    )),
+}
+
+def _migrate_items(cursor: sqlite3.Cursor, version: int):
+    """Rebuilds an items table created by an older schema version with the current schema.
+    Runs inside init_db's transaction."""
+    print(f"Migrating items table from schema version {version} to {_SCHEMA_VERSION}...")
+    cursor.execute("ALTER TABLE items RENAME TO items_old")
+    for statement in _SQL_CREATE_TABLES:
+        cursor.execute(statement)
+    for statement in _SQL_MIGRATE_ITEMS[version]:
+        cursor.execute(statement)
+    # Carry over the AUTOINCREMENT counter so IDs of deleted items are never reused.
+    cursor.execute("""
+        UPDATE sqlite_sequence
+        SET seq = MAX(seq, COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'items_old'), 0))
+        WHERE name = 'items'
+    """)
+    cursor.execute("DROP TABLE items_old")
+
 def init_db():
-    """Initializes the SQLite database and creates the items table if it doesn't exist."""
-    with sqlite3.connect(DB_NAME) as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS items (
-                id TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                price REAL,
-                category TEXT,
-                additional_data TEXT -- To store other fields as a JSON string
-            )
-        """)
-        conn.commit()
+    """Initializes the SQLite database, creating or migrating the inventory tables as needed."""
+    with _LOCK:
+        cursor = _cursor()
+        # IMMEDIATE takes the write lock before the schema version is read, so when several
+        # worker processes start at once only the first migrates; the others wait for it and
+        # then read the current version.
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            version = cursor.execute("PRAGMA user_version").fetchone()[0]
+            has_items = cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'items'").fetchone()
+            if has_items and version in _SQL_MIGRATE_ITEMS:
+                _migrate_items(cursor, version)
+            for statement in _SQL_CREATE_TABLES:
+                cursor.execute(statement)
+            # Inherits the column's NOCASE collation, so "category = ?" seeks it case-insensitively.
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_items_cat_price ON items(category, price)")
+            for statement in _SQL_CREATE_SEARCH_INDEX:
+                cursor.execute(statement)
+            if has_items and version < _SCHEMA_VERSION:
+                for statement in _SQL_REBUILD_SEARCH_INDEX:
+                    cursor.execute(statement)
+            cursor.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        cursor.execute("PRAGMA optimize")
     print(f"Database '{DB_NAME}' initialized.")
 
 # Call init_db when the script loads to ensure the table exists
@@ -28,21 +274,86 @@ init_db()
 # --- Helper functions for database interaction ---
 def _serialize_additional_data(data: Dict[str, Any]) -> str:
     """Serializes a dictionary to a JSON string for storing."""
-    return json.dumps(data)
+    return _json_dumps(data)
 
 def _deserialize_additional_data(json_str: Optional[str]) -> Dict[str, Any]:
     """Deserializes a JSON string back to a dictionary."""
     if json_str:
-        return json.loads(json_str)
+        return _json_loads(json_str)
     return {}
 
+def _validate_item_data(item_data: Any) -> Optional[str]:
+    """Returns an error message if item_data can't be used to create an item, else None."""
+    if not isinstance(item_data, dict) or not item_data:
+        return "Item data must be a non-empty dictionary."
+    if 'name' not in item_data or not item_data['name']:
+        return "Item 'name' is required and cannot be empty."
+    return None
+
+def _item_row(item_data: Dict[str, Any]) -> Tuple[str, Any, Any, Any, Optional[str]]:
+    """Builds the (uuid, name, price, category, additional_data) insert parameters for a new item.
+    additional_data is None when there are no other fields."""
+    item_data = dict(item_data)
+    name = item_data.pop('name')
+    price = item_data.pop('price', None)
+    category = item_data.pop('category', None)
+    additional_data_json = _serialize_additional_data(item_data) if item_data else None # Remaining data
+    return (str(uuid.uuid4()), name, price, category, additional_data_json)
+
+def _fts_query(text: str) -> str:
+    """Turns free text into an FTS5 query matching every word as a prefix, with FTS5
+    syntax characters quoted away."""
+    return " ".join('"' + word.replace('"', '""') + '"*' for word in text.split())
+
+def _item_key(item_id: Union[int, str]) -> Optional[Tuple[str, Union[int, str]]]:
+    """Resolves an item reference to (key column, value): integer IDs (or numeric strings)
+    look up by id, anything else by uuid. Returns None for an invalid reference."""
+    if isinstance(item_id, int) and not isinstance(item_id, bool):
+        return "id", item_id
+    if isinstance(item_id, str) and item_id.strip():
+        item_id = item_id.strip()
+        # isdigit() alone also accepts non-ASCII digits like "²", which int() rejects.
+        return ("id", int(item_id)) if item_id.isascii() and item_id.isdigit() else ("uuid", item_id)
+    return None
+
+# --- Item read cache ---
+# Recently read/updated items keyed by ("id", id) and ("uuid", uuid), so repeated read_item
+# calls within a conversation skip the query and row decoding. Only touched while holding
+# _LOCK. Writes through this module update or evict entries directly; writes by other
+# connections (e.g. other worker processes) are detected via PRAGMA data_version.
+_ITEM_CACHE_SIZE: Final = 1024
+_item_cache: "OrderedDict[Tuple[str, Union[int, str]], Dict[str, Any]]" = OrderedDict()
+_item_cache_data_version: Optional[int] = None
+
+def _validate_item_cache(cursor: sqlite3.Cursor):
+    """Drops all cached items if another connection has committed since the last check."""
+    global _item_cache_data_version
+    data_version = cursor.execute("PRAGMA data_version").fetchone()[0]
+    if data_version != _item_cache_data_version:
+        _item_cache.clear()
+        _item_cache_data_version = data_version
+
+def _cache_item(item: Dict[str, Any]):
+    """Stores an item under both of its keys, evicting the least recently used entries."""
+    for column in _KEY_COLUMNS:
+        _item_cache[(column, item[column])] = item
+        _item_cache.move_to_end((column, item[column]))
+    while len(_item_cache) > _ITEM_CACHE_SIZE:
+        _item_cache.popitem(last=False)
+
+def _uncache_item(item_id: int, item_uuid: str):
+    """Evicts an item from the cache."""
+    _item_cache.pop(("id", item_id), None)
+    _item_cache.pop(("uuid", item_uuid), None)
+
 def _dict_factory(cursor, row):
     """Converts database rows to dictionaries, including deserializing additional_data."""
-    d = {"id": row[0], "name": row[1], "price": row[2], "category": row[3]}
-    additional = _deserialize_additional_data(row[4])
+    d = {"id": row[0], "uuid": row[1], "name": row[2], "price": row[3], "category": row[4]}
+    additional = _deserialize_additional_data(row[5])
     d.update(additional) # Merge additional data into the main dictionary
-    # Ensure 'id' from the main column is preserved, not overwritten by additional_data
+    # Ensure 'id' and 'uuid' from the main columns are preserved, not overwritten by additional_data
     d["id"] = row[0]
+    d["uuid"] = row[1]
     return d
 
 
@@ -58,57 +369,109 @@ def create_item(item_data: Dict[str, Any]) -> Dict[str, Any]:
                                      Example: {"name": "Laptop", "price": 1200, "category": "Electronics", "stock": 50}
 
     Returns:
-        Dict[str, Any]: A dictionary containing the ID of the newly created item and a status message.
+        Dict[str, Any]: A dictionary containing the integer ID and the UUID of the newly created item and a status message.
     """
     print(f"--- Tool: create_item (SQLite) called with data: {item_data} ---")
-    if not isinstance(item_data, dict) or not item_data:
-        return {"status": "error", "message": "Item data must be a non-empty dictionary."}
-    if 'name' not in item_data or not item_data['name']:
-        return {"status": "error", "message": "Item 'name' is required and cannot be empty."}
+    error = _validate_item_data(item_data)
+    if error:
+        return {"status": "error", "message": error}
 
-    item_id = str(uuid.uuid4())
-    name = item_data.pop('name')
-    price = item_data.pop('price', None)
-    category = item_data.pop('category', None)
-    additional_data_json = _serialize_additional_data(item_data) # Remaining data
+    row = _item_row(item_data)
+    item_uuid, name = row[0], row[1]
 
     try:
-        with sqlite3.connect(DB_NAME) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO items (id, name, price, category, additional_data)
-                VALUES (?, ?, ?, ?, ?)
-            """, (item_id, name, price, category, additional_data_json))
-            conn.commit()
-        return {"status": "success", "item_id": item_id, "message": f"Item '{name}' created with ID: {item_id}."}
+        with _LOCK:
+            cursor = _cursor()
+            cursor.execute("BEGIN")
+            try:
+                cursor.execute(_SQL_INSERT, row[:4])
+                item_id = cursor.fetchone()[0]
+                if row[4] is not None:
+                    cursor.execute(_SQL_INSERT_EXTRA, (item_id, row[4]))
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+        return {"status": "success", "item_id": item_id, "uuid": item_uuid, "message": f"Item '{name}' created with ID: {item_id}."}
     except sqlite3.Error as e:
         return {"status": "error", "message": f"SQLite error: {str(e)}"}
     except Exception as e:
         return {"status": "error", "message": f"Failed to create item: {str(e)}"}
 
+def create_items(items_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Creates several new items at once in a single SQLite transaction. Use this instead of
+    repeated create_item calls when adding more than one item.
+
+    Args:
+        items_data (List[Dict[str, Any]]): A list of item dictionaries, each in the same format as for create_item.
+                                           Example: [{"name": "Laptop", "price": 1200}, {"name": "Mouse", "price": 25, "category": "Electronics"}]
+
+    Returns:
+        Dict[str, Any]: A dictionary containing the IDs and UUIDs of the newly created items and a status message.
+    """
+    print(f"--- Tool: create_items (SQLite) called with {len(items_data) if isinstance(items_data, list) else 0} items ---")
+    if not isinstance(items_data, list) or not items_data:
+        return {"status": "error", "message": "Items data must be a non-empty list of item dictionaries."}
+    for index, item_data in enumerate(items_data):
+        error = _validate_item_data(item_data)
+        if error:
+            return {"status": "error", "message": f"Item {index + 1}: {error} No items were created."}
+
+    rows = [_item_row(item_data) for item_data in items_data]
+
+    try:
+        with _LOCK:
+            cursor = _cursor()
+            # One transaction (and one commit) for the whole batch instead of one per item.
+            cursor.execute("BEGIN")
+            try:
+                cursor.executemany(_SQL_INSERT_ROW, [row[:4] for row in rows])
+                cursor.executemany(_SQL_INSERT_EXTRA_BY_UUID, [(row[4], row[0]) for row in rows if row[4] is not None])
+                cursor.execute(_SQL_SELECT_IDS_BY_UUID, (_json_dumps([row[0] for row in rows]),))
+                item_ids = [row[0] for row in cursor.fetchall()]
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+        created = [{"item_id": item_id, "uuid": row[0], "name": row[1]} for item_id, row in zip(item_ids, rows)]
+        return {"status": "success", "items": created, "message": f"{len(created)} items created."}
+    except sqlite3.Error as e:
+        return {"status": "error", "message": f"SQLite error: {str(e)}"}
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to create items: {str(e)}"}
+
 def read_item(item_id: str) -> Dict[str, Any]:
     """
     Retrieves an item by its ID from the SQLite database.
 
     Args:
-        item_id (str): The unique identifier of the item to retrieve.
+        item_id (str): The item's numeric ID (e.g. "12") or its UUID.
 
     Returns:
         Dict[str, Any]: A dictionary containing the item's data if found, or an error message.
     """
     print(f"--- Tool: read_item (SQLite) called for ID: {item_id} ---")
-    if not item_id or not isinstance(item_id, str):
-        return {"status": "error", "message": "Invalid item ID provided. It must be a string."}
+    key = _item_key(item_id)
+    if key is None:
+        return {"status": "error", "message": "Invalid item ID provided. It must be a numeric ID or a UUID string."}
 
     try:
-        with sqlite3.connect(DB_NAME) as conn:
-            conn.row_factory = _dict_factory # Use custom row factory
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, name, price, category, additional_data FROM items WHERE id = ?", (item_id,))
-            item = cursor.fetchone()
+        with _LOCK:
+            cursor = _cursor()
+            _validate_item_cache(cursor)
+            item = _item_cache.get(key)
+            if item is not None:
+                _item_cache.move_to_end(key)
+            else:
+                cursor.row_factory = _dict_factory # Use custom row factory
+                cursor.execute(_SQL_SELECT_ONE[key[0]], (key[1],))
+                item = cursor.fetchone()
+                if item:
+                    _cache_item(item)
 
         if item:
-            return {"status": "success", "item": item}
+            return {"status": "success", "item": copy.deepcopy(item)} # Deep copy so callers can't mutate the cached item or its nested values
         else:
             return {"status": "error", "message": f"Item with ID '{item_id}' not found."}
     except sqlite3.Error as e:
@@ -117,40 +480,34 @@ def read_item(item_id: str) -> Dict[str, Any]:
         return {"status": "error", "message": f"Failed to read item: {str(e)}"}
 
 
-def read_all_items(category: Optional[str] = None, min_price: Optional[float] = None, max_price: Optional[float] = None) -> Dict[str, Any]:
+def read_all_items(category: Optional[str] = None, min_price: Optional[float] = None, max_price: Optional[float] = None, include_extra: bool = False) -> Dict[str, Any]:
     """
     Retrieves all items from SQLite, optionally filtering by category, min_price, and/or max_price.
+    By default only each item's id, uuid, name, price and category are returned.
 
     Args:
         category (Optional[str]): The category to filter items by.
         min_price (Optional[float]): The minimum price to filter items by.
         max_price (Optional[float]): The maximum price to filter items by.
+        include_extra (bool): Also return each item's other fields (e.g. stock, color). Only set this when those fields are needed.
 
     Returns:
         Dict[str, Any]: A dictionary containing a list of items or an error message.
     """
-    print(f"--- Tool: read_all_items (SQLite) called with category: {category}, min_price: {min_price}, max_price: {max_price} ---")
-    query = "SELECT id, name, price, category, additional_data FROM items"
-    conditions = []
+    print(f"--- Tool: read_all_items (SQLite) called with category: {category}, min_price: {min_price}, max_price: {max_price}, include_extra: {include_extra} ---")
+    query = _build_read_all_sql(bool(include_extra), bool(category), min_price is not None, max_price is not None)
     params = []
 
     if category:
-        conditions.append("LOWER(category) = LOWER(?)")
         params.append(category)
     if min_price is not None:
-        conditions.append("price >= ?")
         params.append(min_price)
     if max_price is not None:
-        conditions.append("price <= ?")
         params.append(max_price)
 
-    if conditions:
-        query += " WHERE " + " AND ".join(conditions)
-
     try:
-        with sqlite3.connect(DB_NAME) as conn:
-            conn.row_factory = _dict_factory # Use custom row factory
-            cursor = conn.cursor()
+        with _LOCK:
+            cursor = _cursor(_dict_factory) # Use custom row factory
             cursor.execute(query, tuple(params))
             items = cursor.fetchall()
 
@@ -163,84 +520,93 @@ def read_all_items(category: Optional[str] = None, min_price: Optional[float] =
     except Exception as e:
         return {"status": "error", "message": f"Failed to read items: {str(e)}"}
 
+def search_items(query: str) -> Dict[str, Any]:
+    """
+    Searches items by keywords in their name, category and other fields (e.g. "harry potter", "red shirt").
+    Every word must match, and words also match as prefixes ("lap" matches "laptop").
+
+    Args:
+        query (str): The keywords to search for.
+
+    Returns:
+        Dict[str, Any]: A dictionary containing the best matching items (up to 50) or an error message.
+    """
+    print(f"--- Tool: search_items (SQLite) called with query: {query} ---")
+    if not isinstance(query, str) or not query.strip():
+        return {"status": "error", "message": "Search query must be a non-empty string."}
+
+    try:
+        with _LOCK:
+            cursor = _cursor(_dict_factory) # Use custom row factory
+            cursor.execute(_SQL_SEARCH, (_fts_query(query),))
+            items = cursor.fetchall()
+
+        if not items:
+            return {"status": "success", "items": [], "message": f"No items found matching '{query}'."}
+        return {"status": "success", "items": items}
+    except sqlite3.Error as e:
+        return {"status": "error", "message": f"SQLite error: {str(e)}"}
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to search items: {str(e)}"}
+
 def update_item(item_id: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Updates an existing item in SQLite with new data. Only provided fields are updated.
 
     Args:
-        item_id (str): The unique identifier of the item to update.
+        item_id (str): The item's numeric ID (e.g. "12") or its UUID.
         update_data (Dict[str, Any]): A dictionary containing the fields to update and their new values.
-                                     Cannot update 'id'.
+                                     'id' and 'uuid' cannot be changed and are ignored.
 
     Returns:
         Dict[str, Any]: A dictionary confirming the update or an error message.
     """
     print(f"--- Tool: update_item (SQLite) called for ID: {item_id} with data: {update_data} ---")
-    if not item_id or not isinstance(item_id, str):
+    key = _item_key(item_id)
+    if key is None:
         return {"status": "error", "message": "Invalid item ID provided."}
     if not isinstance(update_data, dict) or not update_data:
         return {"status": "error", "message": "Update data must be a non-empty dictionary."}
-    if "id" in update_data and update_data["id"] != item_id: # Prevent changing ID
-         return {"status": "error", "message": "Cannot change item ID during update."}
-    update_data.pop("id", None) # Remove id from update_data if present
+    # IDs can't be changed. Callers often echo the item's id/uuid back alongside the changed
+    # fields, and only one of them matches item_id, so both are dropped rather than compared.
+    update_data = {field: value for field, value in update_data.items() if field not in _KEY_COLUMNS}
+    if not update_data:
+        return {"status": "info", "message": "No valid fields provided for update."}
+
+    if "name" in update_data and not update_data["name"]:
+        return {"status": "error", "message": "Item 'name' cannot be empty."}
+    # Only the columns present are set, so e.g. {"price": None} clears the price.
+    columns = tuple(column for column in ("name", "price", "category") if column in update_data)
+    values = tuple(update_data.pop(column) for column in columns)
+    # Remaining fields are merged into additional_data by SQLite (json_patch), so the
+    # update and read-back take one statement per table.
+    additional_data_patch = _serialize_additional_data(update_data) if update_data else None
 
     try:
-        with sqlite3.connect(DB_NAME) as conn:
-            conn.row_factory = sqlite3.Row # For easier access to current additional_data
-            cursor = conn.cursor()
-
-            # Check if item exists
-            cursor.execute("SELECT additional_data FROM items WHERE id = ?", (item_id,))
-            row = cursor.fetchone()
-            if not row:
-                return {"status": "error", "message": f"Item with ID '{item_id}' not found for update."}
-
-            current_additional_dict = _deserialize_additional_data(row["additional_data"])
-
-            set_clauses = []
-            params = []
-
-            # Standard fields
-            if "name" in update_data:
-                set_clauses.append("name = ?")
-                params.append(update_data.pop("name"))
-            if "price" in update_data:
-                set_clauses.append("price = ?")
-                params.append(update_data.pop("price"))
-            if "category" in update_data:
-                set_clauses.append("category = ?")
-                params.append(update_data.pop("category"))
-
-            # Update additional_data (remaining fields in update_data)
-            if update_data: # If there are still fields in update_data, they go into additional_data
-                current_additional_dict.update(update_data)
-                set_clauses.append("additional_data = ?")
-                params.append(_serialize_additional_data(current_additional_dict))
-            elif not current_additional_dict and not update_data and "additional_data" not in [c.split("=")[0].strip() for c in set_clauses]:
-                # If there was no additional data and no new additional data is being added,
-                # ensure it's not accidentally set if it wasn't touched.
-                # This case is mostly handled by how update_data is consumed.
-                pass
-
-
-            if not set_clauses:
-                return {"status": "info", "message": "No valid fields provided for update."}
-
-            query = f"UPDATE items SET {', '.join(set_clauses)} WHERE id = ?"
-            params.append(item_id)
-
-            cursor.execute(query, tuple(params))
-            conn.commit()
-
-            if cursor.rowcount == 0: # Should have been caught by the select earlier
-                return {"status": "error", "message": f"Item with ID '{item_id}' not found for update (race condition?)."}
-
-        # Fetch the updated item to return it
-        updated_item_response = read_item(item_id)
-        if updated_item_response["status"] == "success":
-            return {"status": "success", "item_id": item_id, "message": f"Item '{item_id}' updated successfully.", "updated_item": updated_item_response["item"]}
-        else: # Should not happen if update was successful
-            return {"status": "warning", "item_id": item_id, "message": f"Item '{item_id}' updated, but failed to retrieve afterwards."}
+        with _LOCK:
+            cursor = _cursor()
+            cursor.execute("BEGIN")
+            try:
+                cursor.execute(_build_update_sql(key[0], columns), (*values, key[1]))
+                row = cursor.fetchone()
+                updated_item = None
+                if row:
+                    if additional_data_patch is not None:
+                        cursor.execute(_SQL_PATCH_EXTRA, (row[0], additional_data_patch, additional_data_patch))
+                    else:
+                        cursor.execute(_SQL_SELECT_EXTRA, (row[0],))
+                    extra = cursor.fetchone()
+                    updated_item = _dict_factory(cursor, (*row, extra[0] if extra else None))
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+            if updated_item:
+                _cache_item(updated_item)
+
+        if not updated_item:
+            return {"status": "error", "message": f"Item with ID '{item_id}' not found for update."}
+        return {"status": "success", "item_id": item_id, "message": f"Item '{item_id}' updated successfully.", "updated_item": copy.deepcopy(updated_item)}
 
     except sqlite3.Error as e:
         return {"status": "error", "message": f"SQLite error: {str(e)}"}
@@ -253,30 +619,29 @@ def delete_item(item_id: str) -> Dict[str, Any]:
     Deletes an item by its ID from the SQLite database.
 
     Args:
-        item_id (str): The unique identifier of the item to delete.
+        item_id (str): The item's numeric ID (e.g. "12") or its UUID.
 
     Returns:
         Dict[str, Any]: A dictionary confirming the deletion or an error message.
     """
     print(f"--- Tool: delete_item (SQLite) called for ID: {item_id} ---")
-    if not item_id or not isinstance(item_id, str):
+    key = _item_key(item_id)
+    if key is None:
         return {"status": "error", "message": "Invalid item ID provided."}
 
     try:
-        with sqlite3.connect(DB_NAME) as conn:
-            cursor = conn.cursor()
-            # Optionally, retrieve name before deleting for a more informative message
-            cursor.execute("SELECT name FROM items WHERE id = ?", (item_id,))
+        with _LOCK:
+            cursor = _cursor()
+            # RETURNING gives the deleted item's name for a more informative message
+            cursor.execute(_SQL_DELETE[key[0]], (key[1],))
             row = cursor.fetchone()
-            item_name = row[0] if row else "Unknown"
-
-            cursor.execute("DELETE FROM items WHERE id = ?", (item_id,))
-            conn.commit()
+            if row:
+                _uncache_item(row[0], row[1])
 
-            if cursor.rowcount > 0:
-                return {"status": "success", "item_id": item_id, "message": f"Item '{item_name}' (ID: {item_id}) deleted successfully."}
-            else:
-                return {"status": "error", "message": f"Item with ID '{item_id}' not found for deletion."}
+        if row:
+            return {"status": "success", "item_id": item_id, "message": f"Item '{row[2]}' (ID: {item_id}) deleted successfully."}
+        else:
+            return {"status": "error", "message": f"Item with ID '{item_id}' not found for deletion."}
     except sqlite3.Error as e:
         return {"status": "error", "message": f"SQLite error: {str(e)}"}
     except Exception as e:
@@ -2,9 +2,8 @@ import os
 import sys
 import uvicorn
 from fastapi import FastAPI
-from google.adk.cli.fast_api import get_fast_api_app
+from fastapi.middleware.gzip import GZipMiddleware
 from dotenv import load_dotenv
-from control_agent import root_agent
 
 # Set up paths
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
@@ -15,36 +14,66 @@ DB_FILE = os.path.join(BASE_DIR, 'bot_sessions.db')
 SESSION_DB_URL = f"sqlite:///{DB_FILE}"
 # Initialize SQLite database
 
-# Create the FastAPI app using ADK's helper
-app: FastAPI = get_fast_api_app(
-    agent_dir=AGENT_DIR,
-    session_db_url=SESSION_DB_URL,
-    allow_origins=["*"],  # In production, restrict this
-    web=True,  # Enable the ADK Web UI
-)
-
-# Add custom endpoints
-@app.get("/health")
-async def health_check():
-    return {"status": "healthy"}
-
-@app.get("/agent-info")
-async def agent_info():
-    """Provide agent information"""
-
-    return {
-        "agent_name": root_agent.name,
-        "description": root_agent.description,
-        "model": root_agent.model,
-        "tools": [tool.name for tool in root_agent.tools],
-    }
+def build_app() -> FastAPI:
+    """Creates the FastAPI app. google.adk and the agents are imported here rather than at
+    module level, so the uvicorn supervisor process never loads them."""
+    from google.adk.cli.fast_api import get_fast_api_app
+    from control_agent import prerouter
+
+    # Load the control agent's embedding model and train its pre-router in background threads
+    # now, rather than on the event loop during the first requests.
+    prerouter.warm_up()
+
+    # Create the FastAPI app using ADK's helper
+    app: FastAPI = get_fast_api_app(
+        agent_dir=AGENT_DIR,
+        session_db_url=SESSION_DB_URL,
+        allow_origins=["*"],  # In production, restrict this
+        web=True,  # Enable the ADK Web UI
+    )
+    # Compress larger (agent/tool output) responses.
+    app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+    # Add custom endpoints
+    @app.get("/health")
+    async def health_check():
+        return {"status": "healthy"}
+
+    @app.get("/agent-info")
+    async def agent_info():
+        """Provide agent information"""
+        from control_agent import root_agent
+
+        return {
+            "agent_name": root_agent.name,
+            "description": root_agent.description,
+            "model": root_agent.model,
+            # Plain function tools (e.g. batch_call) have no .name attribute
+            "tools": [getattr(tool, "name", getattr(tool, "__name__", None)) for tool in root_agent.tools],
+        }
+
+    return app
+
+def __getattr__(name):
+    # Builds `app` on first access for `uvicorn main:app` and other importers (PEP 562).
+    if name == "app":
+        global app
+        app = build_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == "__main__":
     # Run as web server (default)
     print("Starting Web server mode...")
+    # uvicorn picks uvloop and httptools automatically when installed (uvicorn[standard]).
+    # One worker by default: ADK's artifact and memory services are in-memory, so they'd
+    # differ between worker processes, and each worker loads its own embedding model. Set
+    # WEB_CONCURRENCY to opt in to more (each worker calls the factory).
     uvicorn.run(
-            app, 
-            host="0.0.0.0", 
-            port=9999, 
-            reload=False
-    )
\ No newline at end of file
+            "main:build_app",
+            factory=True,
+            host="0.0.0.0",
+            port=9999,
+            reload=False,
+            workers=int(os.environ.get("WEB_CONCURRENCY", 1)),
+    )
@@ -2,6 +2,21 @@ import datetime
 from zoneinfo import ZoneInfo
 from google.adk.agents import Agent
 
+# Static per-city data, keyed by lower-cased city name and built once at import so the
+# tools only do a dict lookup (plus datetime.now for the time). Treat as read-only.
+_TIMEZONES = {
+    "new york": ZoneInfo("America/New_York"),
+}
+_WEATHER_REPORTS = {
+    "new york": {
+        "status": "success",
+        "report": (
+            "The weather in New York is sunny with a temperature of 25 degrees"
+            " Celsius (77 degrees Fahrenheit)."
+        ),
+    },
+}
+
 def get_weather(city: str) -> dict:
     """Retrieves the current weather report for a specified city.
 
@@ -11,14 +26,9 @@ def get_weather(city: str) -> dict:
     Returns:
         dict: status and result or error msg.
     """
-    if city.lower() == "new york":
-        return {
-            "status": "success",
-            "report": (
-                "The weather in New York is sunny with a temperature of 25 degrees"
-                " Celsius (77 degrees Fahrenheit)."
-            ),
-        }
+    report = _WEATHER_REPORTS.get(city.lower())
+    if report is not None:
+        return dict(report) # Copy so callers can't mutate the shared report
     else:
         return {
             "status": "error",
@@ -35,9 +45,8 @@ def get_current_time(city: str) -> dict:
         dict: status and result or error msg.
     """
 
-    if city.lower() == "new york":
-        tz_identifier = "America/New_York"
-    else:
+    tz = _TIMEZONES.get(city.lower())
+    if tz is None:
         return {
             "status": "error",
             "error_message": (
@@ -45,7 +54,6 @@ def get_current_time(city: str) -> dict:
             ),
         }
 
-    tz = ZoneInfo(tz_identifier)
     now = datetime.datetime.now(tz)
     report = (
         f'The current time in {city} is {now.strftime("%Y-%m-%d %H:%M:%S %Z%z")}'